@@ -1,12 +1,16 @@
 """Task Manager - Flask application (MongoDB)."""
 import os
 import csv
+import hmac
 import io
 from datetime import datetime, date, time, timedelta
 from functools import wraps
 
+import orjson
 from bson import ObjectId
+from pymongo import ReturnDocument
 from pymongo.errors import ServerSelectionTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
 from flask import (
     Flask,
     render_template,
@@ -15,14 +19,39 @@ from flask import (
     url_for,
     flash,
     jsonify,
-    send_file,
+    Response,
     session,
+    g,
 )
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
+
+from db import get_db, get_read_db, init_db
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; datetimes serialize as ISO 8601 UTC, ObjectIds as hex strings."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-from db import get_db, init_db
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-change-in-production")
+# Cache backend: RedisCache when CACHE_REDIS_URL is set, so cached reports and their
+# invalidation are shared by all workers. Without it caching is off (NullCache): a
+# per-process cache would keep serving stale reports from workers that missed the write.
+app.config["CACHE_REDIS_URL"] = os.environ.get("CACHE_REDIS_URL", "")
+app.config["CACHE_TYPE"] = os.environ.get("CACHE_TYPE") or (
+    "RedisCache" if app.config["CACHE_REDIS_URL"] else "NullCache"
+)
+app.config["CACHE_NO_NULL_WARNING"] = True  # NullCache is the intended default
+app.config["CACHE_DEFAULT_TIMEOUT"] = 60
+cache = Cache(app)
 
 
 # Max lengths for text fields (must match frontend maxlength)
@@ -38,6 +67,9 @@ MAX_HOURS = 999
 MIN_HOURS = 0
 OBJECTID_HEX_LEN = 24
 DUE_DATE_MAX_YEARS = 20
+TASKS_PAGE_SIZE = 50
+# $dateToString format for ISO 8601 UTC timestamps in API responses
+ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%LZ"
 
 
 def _oid(s):
@@ -45,12 +77,17 @@ def _oid(s):
     if not s:
         return None
     s = s.strip()
-    if len(s) != OBJECTID_HEX_LEN or not all(c in "0123456789abcdefABCDEF" for c in s):
+    if len(s) != OBJECTID_HEX_LEN:
         return None
+    # Parse the hex once and build the ObjectId from its 12 raw bytes
     try:
-        return ObjectId(s)
-    except Exception:
+        raw = bytes.fromhex(s)
+    except ValueError:
+        return None
+    if len(raw) != OBJECTID_HEX_LEN // 2:
+        # bytes.fromhex skips embedded whitespace
         return None
+    return ObjectId(raw)
 
 
 def _validate_length(s, max_len, field_name):
@@ -76,6 +113,16 @@ def _validate_due_date(due_date):
     return True, due_date
 
 
+def _parse_ymd(s):
+    """Parse 'YYYY-MM-DD' to a date; return None if empty, raise ValueError if malformed."""
+    if not s:
+        return None
+    # Python 3.11+ fromisoformat also takes 'YYYYMMDD' and week dates; keep the accepted format fixed
+    if len(s) != 10 or s[4] != "-" or s[7] != "-":
+        raise ValueError(f"Invalid date: {s!r}")
+    return date.fromisoformat(s)
+
+
 def _date_for_mongo(d):
     """Convert date to datetime for BSON (MongoDB does not support date type)."""
     if d is None:
@@ -85,14 +132,33 @@ def _date_for_mongo(d):
     return datetime.combine(d, time(0, 0, 0))
 
 
+def _hash_password(password):
+    """Return a salted hash of password for users.password_hash."""
+    return generate_password_hash(password)
+
+
+def _check_password(user, password):
+    """Return True if password matches the user doc ('password_hash', or legacy plaintext 'password')."""
+    if user is None:
+        return False
+    if user.get("password_hash"):
+        return check_password_hash(user["password_hash"], password)
+    legacy = user.get("password")
+    if legacy is None:
+        return False
+    return hmac.compare_digest(legacy.encode("utf-8"), password.encode("utf-8"))
+
+
 def get_current_user():
-    """Current user from session (MongoDB user doc with 'username' and '_id')."""
-    if "user_id" not in session:
-        return None
-    uid = _oid(session["user_id"])
-    if not uid:
-        return None
-    return get_db().users.find_one({"_id": uid})
+    """Current user from session (MongoDB user doc with 'username' and '_id'), loaded once per request."""
+    if "current_user" in g:
+        return g.current_user
+    user = None
+    uid = _oid(session.get("user_id"))
+    if uid:
+        user = get_db().users.find_one({"_id": uid}, {"username": 1})
+    g.current_user = user
+    return user
 
 
 def login_required(f):
@@ -132,18 +198,29 @@ def inject_current_user():
 
 
 def seed_collections():
-    """Create collections and seed initial data if empty."""
+    """Seed initial users and projects if the collections are empty."""
     db = get_db()
-    if db.users.count_documents({}) == 0:
-        for u in [("admin", "admin"), ("user1", "user1"), ("user2", "user2")]:
-            db.users.insert_one({"username": u[0], "password": u[1]})
-    if db.projects.count_documents({}) == 0:
-        for p in [
-            ("Demo Project", "Sample project"),
-            ("Alpha Project", "Main project"),
-            ("Beta Project", "Secondary project"),
-        ]:
-            db.projects.insert_one({"name": p[0], "description": p[1]})
+    # Indexes are built by db.ensure_indexes when the client is first initialised
+    if db.users.estimated_document_count() == 0:
+        db.users.insert_many(
+            [
+                {"username": u, "password_hash": _hash_password(p)}
+                for u, p in [("admin", "admin"), ("user1", "user1"), ("user2", "user2")]
+            ],
+            ordered=False,
+        )
+    if db.projects.estimated_document_count() == 0:
+        db.projects.insert_many(
+            [
+                {"name": n, "description": d}
+                for n, d in [
+                    ("Demo Project", "Sample project"),
+                    ("Alpha Project", "Main project"),
+                    ("Beta Project", "Secondary project"),
+                ]
+            ],
+            ordered=False,
+        )
 
 
 # ---------- Auth routes ----------
@@ -155,8 +232,15 @@ def login():
     if request.method == "POST":
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
-        user = get_db().users.find_one({"username": username, "password": password})
-        if user:
+        db = get_db()
+        user = db.users.find_one({"username": username}, {"password_hash": 1, "password": 1})
+        if _check_password(user, password):
+            if not user.get("password_hash"):
+                # Upgrade a legacy plaintext password to a hash on first successful login
+                db.users.update_one(
+                    {"_id": user["_id"]},
+                    {"$set": {"password_hash": _hash_password(password)}, "$unset": {"password": ""}},
+                )
             session["user_id"] = str(user["_id"])
             flash("Signed in successfully.", "success")
             return redirect(url_for("dashboard"))
@@ -181,6 +265,15 @@ def index():
     return redirect(url_for("login"))
 
 
+# Data each dashboard tab renders (project/user lists, task table + stats)
+DASHBOARD_TAB_DATA = {
+    "tasks": ("projects", "users", "tasks"),
+    "projects": ("projects",),
+    "search": ("projects",),
+    "users": ("users",),
+}
+
+
 @app.route("/dashboard")
 @login_required
 def dashboard():
@@ -190,12 +283,30 @@ def dashboard():
     if tab == "users" and not is_admin:
         return redirect(url_for("dashboard", tab="tasks"))
     db = get_db()
-    projects_cursor = db.projects.find().sort("name", 1)
-    projects = [_doc_with_id(p) for p in projects_cursor]
-    users_cursor = db.users.find().sort("username", 1)
-    users = [_doc_with_id(u) for u in users_cursor]
-    tasks = _get_tasks_for_dashboard(db.tasks.find())
-    stats = _compute_stats(tasks)
+    # Only query what the active tab renders (see DASHBOARD_TAB_DATA)
+    needs = DASHBOARD_TAB_DATA.get(tab, ())
+    projects, users, tasks, stats = [], [], [], None
+    after = _oid(request.args.get("after"))
+    next_after = None
+    if "projects" in needs:
+        projects_cursor = db.projects.find({}, {"name": 1, "description": 1}).sort("name", 1)
+        projects = [_doc_with_id(p) for p in projects_cursor]
+    if "users" in needs:
+        users_cursor = db.users.find({}, {"username": 1}).sort("username", 1)
+        users = [_doc_with_id(u) for u in users_cursor]
+    if "tasks" in needs:
+        # Keyset page, newest first: one extra row tells whether an older page exists
+        page_filter = {"_id": {"$lt": after}} if after else {}
+        pipeline = [
+            {"$match": page_filter},
+            {"$sort": {"_id": -1}},
+            {"$limit": TASKS_PAGE_SIZE + 1},
+        ] + TASK_LIST_PIPELINE
+        tasks = _get_tasks_for_dashboard(db.tasks.aggregate(pipeline))
+        if len(tasks) > TASKS_PAGE_SIZE:
+            tasks = tasks[:TASKS_PAGE_SIZE]
+            next_after = tasks[-1]["id"]
+        stats = _compute_stats()
     return render_template(
         "dashboard.html",
         tab=tab,
@@ -203,6 +314,8 @@ def dashboard():
         users=users,
         tasks=tasks,
         stats=stats,
+        after=after,
+        next_after=next_after,
         is_admin=is_admin,
         max_username=MAX_USERNAME,
         max_password=MAX_PASSWORD,
@@ -210,133 +323,155 @@ def dashboard():
 
 
 def _doc_with_id(doc):
-    """Add string 'id' to a MongoDB doc for templates."""
+    """Add string 'id' to a MongoDB doc for templates (in place; the doc is returned)."""
     if doc is None:
         return None
-    d = dict(doc)
-    d["id"] = str(d["_id"])
-    return d
+    doc["id"] = str(doc["_id"])
+    return doc
+
+
+# Joins each task with only the project/user it references (instead of loading
+# every project and user into memory) and keeps only the fields the task list and
+# CSV export show.
+TASK_LIST_PIPELINE = [
+    {"$lookup": {
+        "from": "projects",
+        "localField": "project_id",
+        "foreignField": "_id",
+        "as": "project",
+        "pipeline": [{"$project": {"name": 1}}],
+    }},
+    {"$lookup": {
+        "from": "users",
+        "localField": "assigned_to",
+        "foreignField": "_id",
+        "as": "assignee",
+        "pipeline": [{"$project": {"username": 1}}],
+    }},
+    {"$addFields": {
+        "project_name": {"$first": "$project.name"},
+        "assignee_username": {"$first": "$assignee.username"},
+    }},
+    {"$project": {
+        "title": 1,
+        "status": 1,
+        "priority": 1,
+        "due_date": 1,
+        "project_name": 1,
+        "assignee_username": 1,
+    }},
+]
 
 
 def _get_tasks_for_dashboard(cursor):
-    """Convert task cursor to list of dicts with id, project_name, assignee_username."""
-    db = get_db()
-    tasks = list(cursor)
-    projects_by_id = {str(p["_id"]): p for p in db.projects.find()}
-    users_by_id = {str(u["_id"]): u for u in db.users.find()}
+    """Convert cursor over TASK_LIST_PIPELINE to list of dicts for the task table."""
     out = []
-    for t in tasks:
-        tid = str(t["_id"])
-        pid = str(t["project_id"]) if t.get("project_id") else None
-        aid = str(t["assigned_to"]) if t.get("assigned_to") else None
+    for t in cursor:
         dd = t.get("due_date")
         if dd:
-            due_str = dd.strftime("%Y-%m-%d") if hasattr(dd, "strftime") else str(dd)[:10]
+            due_str = f"{dd.year:04d}-{dd.month:02d}-{dd.day:02d}" if isinstance(dd, date) else str(dd)[:10]
         else:
             due_str = None
         out.append({
-            "id": tid,
+            "id": str(t["_id"]),
             "title": t.get("title", ""),
             "status": t.get("status", "Pending"),
             "priority": t.get("priority", "Medium"),
-            "project_name": projects_by_id.get(pid, {}).get("name") if pid else None,
-            "assignee_username": users_by_id.get(aid, {}).get("username") if aid else None,
+            "project_name": t.get("project_name"),
+            "assignee_username": t.get("assignee_username"),
             "due_date": dd,
             "due_date_str": due_str,
         })
     return out
 
 
-def _compute_stats(tasks):
-    total = len(tasks)
-    completed = sum(1 for t in tasks if t.get("status") == "Completed")
-    pending = total - completed
-    high_priority = sum(1 for t in tasks if t.get("priority") in ("High", "Critical"))
-    overdue = 0
-    today = date.today()
-    for t in tasks:
-        dd = t.get("due_date")
-        if dd and t.get("status") != "Completed":
-            if isinstance(dd, datetime):
-                d = dd.date()
-            elif isinstance(dd, date):
-                d = dd
-            else:
-                try:
-                    d = dd.date() if hasattr(dd, "date") else datetime.fromisoformat(str(dd).replace("Z", "+00:00")).date()
-                except Exception:
-                    continue
-            if d < today:
-                overdue += 1
+def _compute_stats():
+    """Dashboard counters (total, completed, pending, high priority, overdue).
+
+    Each count is answered from an index built in db.ensure_indexes (status/priority,
+    priority, due_date/status) rather than by scanning every task.
+    """
+    tasks = get_db().tasks
+    today = _date_for_mongo(date.today())
+    completed = tasks.count_documents({"status": "Completed"})
+    pending = tasks.count_documents({"status": {"$ne": "Completed"}})
     return {
-        "total": total,
+        "total": completed + pending,
         "completed": completed,
         "pending": pending,
-        "high_priority": high_priority,
-        "overdue": overdue,
+        "high_priority": tasks.count_documents({"priority": {"$in": ["High", "Critical"]}}),
+        # $lt on a date never matches null/missing, so tasks without a due date drop out
+        "overdue": tasks.count_documents({"due_date": {"$lt": today}, "status": {"$ne": "Completed"}}),
     }
 
 
 # ---------- Tasks ----------
 
-@app.route("/task/add", methods=["POST"])
-@login_required
-def task_add():
-    title_raw = request.form.get("task_title", "").strip()
-    ok, title = _validate_length(title_raw, MAX_TITLE, "Title")
+def _parse_task_form(form):
+    """Return (True, fields) or (False, error_message) for the task add/update form.
+
+    fields holds the validated document values. 'due_date' is only present when the
+    submitted date parsed (None if left empty), so callers decide what a bad date means.
+    """
+    ok, title = _validate_length(form.get("task_title", ""), MAX_TITLE, "Title")
     if not ok:
-        flash(title, "error")
-        return redirect(url_for("dashboard", tab="tasks"))
+        return False, title
     if not title:
-        flash("Title is required.", "error")
-        return redirect(url_for("dashboard", tab="tasks"))
-    desc_raw = request.form.get("task_description", "")
-    ok, description = _validate_length(desc_raw, MAX_DESCRIPTION, "Description")
+        return False, "Title is required."
+    ok, description = _validate_length(form.get("task_description", ""), MAX_DESCRIPTION, "Description")
     if not ok:
-        flash(description, "error")
-        return redirect(url_for("dashboard", tab="tasks"))
+        return False, description
     try:
-        hours_val = float(request.form.get("task_hours") or 0)
-        if not (MIN_HOURS <= hours_val <= MAX_HOURS):
-            flash(f"Estimated hours must be between {MIN_HOURS} and {MAX_HOURS}.", "error")
-            return redirect(url_for("dashboard", tab="tasks"))
+        hours_val = float(form.get("task_hours") or 0)
     except (TypeError, ValueError):
-        flash("Estimated hours must be a number between 0 and 999.", "error")
-        return redirect(url_for("dashboard", tab="tasks"))
+        return False, "Estimated hours must be a number between 0 and 999."
+    if not (MIN_HOURS <= hours_val <= MAX_HOURS):
+        return False, f"Estimated hours must be between {MIN_HOURS} and {MAX_HOURS}."
+    fields = {
+        "title": title,
+        "description": description,
+        "status": form.get("task_status", "Pending"),
+        "priority": form.get("task_priority", "Medium"),
+        "project_id": _oid(form.get("task_project_id") or ""),
+        "assigned_to": _oid(form.get("task_assigned_to") or ""),
+        "estimated_hours": hours_val,
+    }
     try:
-        due = request.form.get("task_due_date")
-        due_date = datetime.strptime(due, "%Y-%m-%d").date() if due else None
+        due_date = _parse_ymd(form.get("task_due_date"))
     except ValueError:
-        due_date = None
+        return True, fields
     ok, due_date = _validate_due_date(due_date)
     if not ok:
-        flash(due_date, "error")
+        return False, due_date
+    fields["due_date"] = _date_for_mongo(due_date)
+    return True, fields
+
+
+@app.route("/task/add", methods=["POST"])
+@login_required
+def task_add():
+    ok, task_doc = _parse_task_form(request.form)
+    if not ok:
+        flash(task_doc, "error")
         return redirect(url_for("dashboard", tab="tasks"))
-    raw_project = request.form.get("task_project_id") or ""
-    raw_assigned = request.form.get("task_assigned_to") or ""
-    project_id = _oid(raw_project)
-    assigned_to = _oid(raw_assigned)
     user = get_current_user()
     now = datetime.utcnow()
-    task_doc = {
-        "title": title,
-        "description": description,
-        "status": request.form.get("task_status", "Pending"),
-        "priority": request.form.get("task_priority", "Medium"),
-        "project_id": project_id,
-        "assigned_to": assigned_to,
-        "due_date": _date_for_mongo(due_date),
-        "estimated_hours": hours_val,
+    task_doc.setdefault("due_date", None)  # unparseable date: create without a due date
+    task_doc.update({
         "actual_hours": 0,
         "created_by": user["_id"],
         "created_at": now,
         "updated_at": now,
-    }
+    })
+    title = task_doc["title"]
+    assigned_to = task_doc["assigned_to"]
     r = get_db().tasks.insert_one(task_doc)
     task_id = r.inserted_id
-    _add_history(task_id, "CREATED", "", title)
+    notification_docs = []
     if assigned_to:
-        _add_notification(assigned_to, f"New task assigned: {title}", "task_assigned")
+        notification_docs.append(_notification_doc(assigned_to, f"New task assigned: {title}", "task_assigned"))
+    _record_task_events([_history_doc(task_id, "CREATED", "", title)], notification_docs)
+    _invalidate_reports()
     flash("Task created.", "success")
     return redirect(url_for("dashboard", tab="tasks"))
 
@@ -348,70 +483,36 @@ def task_update(task_id):
     if not oid:
         flash("Invalid task.", "error")
         return redirect(url_for("dashboard", tab="tasks"))
-    task = get_db().tasks.find_one({"_id": oid})
-    if not task:
-        flash("Task not found.", "error")
-        return redirect(url_for("dashboard", tab="tasks"))
-    title_raw = request.form.get("task_title", "").strip()
-    ok, title = _validate_length(title_raw, MAX_TITLE, "Title")
+    ok, update_fields = _parse_task_form(request.form)
     if not ok:
-        flash(title, "error")
-        return redirect(url_for("dashboard", tab="tasks"))
-    if not title:
-        flash("Title is required.", "error")
-        return redirect(url_for("dashboard", tab="tasks"))
-    desc_raw = request.form.get("task_description", "")
-    ok, description = _validate_length(desc_raw, MAX_DESCRIPTION, "Description")
-    if not ok:
-        flash(description, "error")
-        return redirect(url_for("dashboard", tab="tasks"))
-    try:
-        hours_val = float(request.form.get("task_hours") or 0)
-        if not (MIN_HOURS <= hours_val <= MAX_HOURS):
-            flash(f"Estimated hours must be between {MIN_HOURS} and {MAX_HOURS}.", "error")
-            return redirect(url_for("dashboard", tab="tasks"))
-    except (TypeError, ValueError):
-        flash("Estimated hours must be a number between 0 and 999.", "error")
+        flash(update_fields, "error")
         return redirect(url_for("dashboard", tab="tasks"))
-    try:
-        due = request.form.get("task_due_date")
-        due_date = datetime.strptime(due, "%Y-%m-%d").date() if due else None
-    except ValueError:
-        due_date = task.get("due_date")
-        if isinstance(due_date, datetime):
-            due_date = due_date.date()
-    ok, due_date = _validate_due_date(due_date)
-    if not ok:
-        flash(due_date, "error")
+    # A missing 'due_date' (unparseable date) keeps the task's current due date
+    update_fields["updated_at"] = datetime.utcnow()
+    title = update_fields["title"]
+    assigned_to = update_fields["assigned_to"]
+    # One round trip: apply the update and get the previous status/title for history
+    task = get_db().tasks.find_one_and_update(
+        {"_id": oid},
+        {"$set": update_fields},
+        projection={"status": 1, "title": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if not task:
+        flash("Task not found.", "error")
         return redirect(url_for("dashboard", tab="tasks"))
-    raw_project = request.form.get("task_project_id") or ""
-    raw_assigned = request.form.get("task_assigned_to") or ""
-    project_id = _oid(raw_project)
-    assigned_to = _oid(raw_assigned)
     old_status = task.get("status")
     old_title = task.get("title")
-    get_db().tasks.update_one(
-        {"_id": oid},
-        {
-            "$set": {
-                "title": title,
-                "description": description,
-                "status": request.form.get("task_status", "Pending"),
-                "priority": request.form.get("task_priority", "Medium"),
-                "project_id": project_id,
-                "assigned_to": assigned_to,
-                "due_date": _date_for_mongo(due_date),
-                "estimated_hours": hours_val,
-                "updated_at": datetime.utcnow(),
-            }
-        },
-    )
+    history_docs = []
     if old_status != request.form.get("task_status"):
-        _add_history(oid, "STATUS_CHANGED", old_status or "", request.form.get("task_status", ""))
+        history_docs.append(_history_doc(oid, "STATUS_CHANGED", old_status or "", request.form.get("task_status", "")))
     if old_title != title:
-        _add_history(oid, "TITLE_CHANGED", old_title or "", title)
+        history_docs.append(_history_doc(oid, "TITLE_CHANGED", old_title or "", title))
+    notification_docs = []
     if assigned_to:
-        _add_notification(assigned_to, f"Task updated: {title}", "task_updated")
+        notification_docs.append(_notification_doc(assigned_to, f"Task updated: {title}", "task_updated"))
+    _record_task_events(history_docs, notification_docs)
+    _invalidate_reports()
     flash("Task updated.", "success")
     return redirect(url_for("dashboard", tab="tasks"))
 
@@ -428,8 +529,9 @@ def task_delete(task_id):
         flash("Task not found.", "error")
         return redirect(url_for("dashboard", tab="tasks"))
     title = task.get("title", "")
-    _add_history(oid, "DELETED", title, "")
+    _record_task_events([_history_doc(oid, "DELETED", title, "")])
     get_db().tasks.delete_one({"_id": oid})
+    _invalidate_reports()
     flash("Task deleted.", "success")
     return redirect(url_for("dashboard", tab="tasks"))
 
@@ -456,6 +558,7 @@ def project_add():
         "name": name,
         "description": description,
     })
+    _invalidate_reports()
     flash("Project created.", "success")
     return redirect(url_for("dashboard", tab="projects"))
 
@@ -488,6 +591,7 @@ def project_update(project_id):
         {"_id": oid},
         {"$set": {"name": name, "description": description}},
     )
+    _invalidate_reports()
     flash("Project updated.", "success")
     return redirect(url_for("dashboard", tab="projects"))
 
@@ -500,6 +604,7 @@ def project_delete(project_id):
         flash("Invalid project.", "error")
         return redirect(url_for("dashboard", tab="projects"))
     get_db().projects.delete_one({"_id": oid})
+    _invalidate_reports()
     flash("Project deleted.", "success")
     return redirect(url_for("dashboard", tab="projects"))
 
@@ -529,7 +634,8 @@ def user_add():
     if not ok:
         flash(password, "error")
         return redirect(url_for("dashboard", tab="users"))
-    get_db().users.insert_one({"username": username, "password": password})
+    get_db().users.insert_one({"username": username, "password_hash": _hash_password(password)})
+    _invalidate_reports()
     flash("User created.", "success")
     return redirect(url_for("dashboard", tab="users"))
 
@@ -558,15 +664,17 @@ def user_update(user_id):
     if existing:
         flash("Username already in use.", "error")
         return redirect(url_for("dashboard", tab="users"))
-    update_fields = {"username": username}
+    update = {"$set": {"username": username}}
     password_raw = request.form.get("user_password", "")
     if password_raw:
         ok, password = _validate_length(password_raw, MAX_PASSWORD, "Password")
         if not ok:
             flash(password, "error")
             return redirect(url_for("dashboard", tab="users"))
-        update_fields["password"] = password
-    get_db().users.update_one({"_id": oid}, {"$set": update_fields})
+        update["$set"]["password_hash"] = _hash_password(password)
+        update["$unset"] = {"password": ""}
+    get_db().users.update_one({"_id": oid}, update)
+    _invalidate_reports()
     flash("User updated.", "success")
     return redirect(url_for("dashboard", tab="users"))
 
@@ -587,6 +695,7 @@ def user_delete(user_id):
         flash("Cannot delete the admin user.", "error")
         return redirect(url_for("dashboard", tab="users"))
     get_db().users.delete_one({"_id": oid})
+    _invalidate_reports()
     flash("User deleted.", "success")
     return redirect(url_for("dashboard", tab="users"))
 
@@ -603,7 +712,8 @@ def user_change_password():
     if not current_password:
         flash("Current password is required.", "error")
         return redirect(url_for("dashboard"))
-    if get_db().users.find_one({"_id": user["_id"], "password": current_password}) is None:
+    stored = get_db().users.find_one({"_id": user["_id"]}, {"password_hash": 1, "password": 1})
+    if not _check_password(stored, current_password):
         flash("Current password is incorrect.", "error")
         return redirect(url_for("dashboard"))
     if not new_password:
@@ -613,7 +723,10 @@ def user_change_password():
     if not ok:
         flash(new_password, "error")
         return redirect(url_for("dashboard"))
-    get_db().users.update_one({"_id": user["_id"]}, {"$set": {"password": new_password}})
+    get_db().users.update_one(
+        {"_id": user["_id"]},
+        {"$set": {"password_hash": _hash_password(new_password)}, "$unset": {"password": ""}},
+    )
     flash("Password updated.", "success")
     return redirect(url_for("dashboard"))
 
@@ -658,7 +771,7 @@ def comment_add():
 @login_required
 def notifications_mark_read():
     get_db().notifications.update_many(
-        {"user_id": get_current_user()["_id"]},
+        {"user_id": get_current_user()["_id"], "read": False},
         {"$set": {"read": True}},
     )
     flash("Notifications marked as read.", "success")
@@ -673,24 +786,28 @@ def api_task(task_id):
     oid = _oid(task_id)
     if not oid:
         return jsonify({"error": "Invalid task"}), 404
-    task = get_db().tasks.find_one({"_id": oid})
+    task = get_db().tasks.find_one({"_id": oid}, {
+        "title": 1, "description": 1, "status": 1, "priority": 1, "project_id": 1,
+        "assigned_to": 1, "due_date": 1, "estimated_hours": 1, "created_by": 1,
+    })
     if not task:
         return jsonify({"error": "Not found"}), 404
     dd = task.get("due_date")
     due_str = ""
     if dd:
         due_str = dd.isoformat() if isinstance(dd, date) else str(dd)[:10]
+    # ObjectIds are stringified by OrjsonProvider (default=str)
     return jsonify({
-        "id": str(task["_id"]),
+        "id": task["_id"],
         "title": task.get("title", ""),
         "description": task.get("description", ""),
         "status": task.get("status", "Pending"),
         "priority": task.get("priority", "Medium"),
-        "project_id": str(task["project_id"]) if task.get("project_id") else "",
-        "assigned_to": str(task["assigned_to"]) if task.get("assigned_to") else "",
+        "project_id": task.get("project_id") or "",
+        "assigned_to": task.get("assigned_to") or "",
         "due_date": due_str,
         "estimated_hours": task.get("estimated_hours", 0),
-        "created_by": str(task["created_by"]) if task.get("created_by") else "",
+        "created_by": task.get("created_by") or "",
     })
 
 
@@ -700,17 +817,25 @@ def api_comments(task_id):
     oid = _oid(task_id)
     if not oid:
         return jsonify([])
-    comments = list(get_db().comments.find({"task_id": oid}).sort("created_at", 1))
-    users = {u["_id"]: u["username"] for u in get_db().users.find()}
-    return jsonify([
-        {
-            "id": str(c["_id"]),
-            "user": users.get(c["user_id"], "?"),
-            "text": c.get("comment_text", ""),
-            "created_at": c.get("created_at", datetime.utcnow()).isoformat(),
-        }
-        for c in comments
-    ])
+    pipeline = [
+        {"$match": {"task_id": oid}},
+        {"$sort": {"created_at": 1}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "_id",
+            "as": "user",
+            "pipeline": [{"$project": {"username": 1}}],
+        }},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "user": {"$ifNull": [{"$first": "$user.username"}, "?"]},
+            "text": {"$ifNull": ["$comment_text", ""]},
+            "created_at": {"$dateToString": {"format": ISO_DATETIME_FORMAT, "date": "$created_at"}},
+        }},
+    ]
+    return jsonify(list(get_db().comments.aggregate(pipeline)))
 
 
 @app.route("/api/history")
@@ -722,55 +847,58 @@ def api_history(task_id=None):
         oid = _oid(task_id)
         if oid:
             q["task_id"] = oid
-    entries = list(get_db().history.find(q).sort("timestamp", -1).limit(100))
-    users = {u["_id"]: u["username"] for u in get_db().users.find()}
-    return jsonify([
-        {
-            "id": str(e["_id"]),
-            "task_id": str(e["task_id"]),
-            "user": users.get(e["user_id"], "?"),
-            "action": e.get("action", ""),
-            "old_value": e.get("old_value", ""),
-            "new_value": e.get("new_value", ""),
-            "timestamp": e.get("timestamp", datetime.utcnow()).isoformat(),
-        }
-        for e in entries
-    ])
+    pipeline = [
+        {"$match": q},
+        {"$sort": {"timestamp": -1}},
+        {"$limit": 100},
+        {"$lookup": {
+            "from": "users",
+            "localField": "user_id",
+            "foreignField": "_id",
+            "as": "user",
+            "pipeline": [{"$project": {"username": 1}}],
+        }},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "task_id": {"$toString": "$task_id"},
+            "user": {"$ifNull": [{"$first": "$user.username"}, "?"]},
+            "action": {"$ifNull": ["$action", ""]},
+            "old_value": {"$ifNull": ["$old_value", ""]},
+            "new_value": {"$ifNull": ["$new_value", ""]},
+            "timestamp": {"$dateToString": {"format": ISO_DATETIME_FORMAT, "date": "$timestamp"}},
+        }},
+    ]
+    return jsonify(list(get_read_db().history.aggregate(pipeline)))
 
 
 @app.route("/api/notifications")
 @login_required
 def api_notifications():
-    notifs = list(
-        get_db().notifications.find({
-            "user_id": get_current_user()["_id"],
-            "read": False,
-        }).sort("created_at", -1)
-    )
-    return jsonify([
-        {
-            "id": str(n["_id"]),
-            "message": n.get("message", ""),
-            "type": n.get("type", "info"),
-            "created_at": n.get("created_at", datetime.utcnow()).isoformat(),
-        }
-        for n in notifs
-    ])
+    pipeline = [
+        {"$match": {"user_id": get_current_user()["_id"], "read": False}},
+        {"$sort": {"created_at": -1}},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "message": {"$ifNull": ["$message", ""]},
+            "type": {"$ifNull": ["$type", "info"]},
+            "created_at": {"$dateToString": {"format": ISO_DATETIME_FORMAT, "date": "$created_at"}},
+        }},
+    ]
+    return jsonify(list(get_db().notifications.aggregate(pipeline)))
 
 
 @app.route("/api/search")
 @login_required
 def api_search():
     q_filter = {}
-    q_raw = request.args.get("q", "").strip().lower()
+    q_raw = request.args.get("q", "").strip()
     ok, q = _validate_length(q_raw, MAX_SEARCH, "Search text")
     if not ok:
         return jsonify({"error": q}), 400
     if q:
-        q_filter["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}},
-        ]
+        q_filter["$text"] = {"$search": q}
     status = request.args.get("status", "").strip()
     if status:
         q_filter["status"] = status
@@ -780,93 +908,155 @@ def api_search():
     project_id = _oid(request.args.get("project_id", ""))
     if project_id:
         q_filter["project_id"] = project_id
-    tasks = list(get_db().tasks.find(q_filter))
-    projects_by_id = {str(p["_id"]): p["name"] for p in get_db().projects.find()}
-    return jsonify([
-        {
-            "id": str(t["_id"]),
-            "title": t.get("title", ""),
-            "status": t.get("status", "Pending"),
-            "priority": t.get("priority", "Medium"),
-            "project": projects_by_id.get(str(t.get("project_id")), "No project"),
-        }
-        for t in tasks
-    ])
+    pipeline = [{"$match": q_filter}]
+    if q:
+        pipeline.append({"$sort": {"score": {"$meta": "textScore"}}})
+    pipeline += [
+        {"$lookup": {
+            "from": "projects",
+            "localField": "project_id",
+            "foreignField": "_id",
+            "as": "project",
+            "pipeline": [{"$project": {"name": 1}}],
+        }},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "title": {"$ifNull": ["$title", ""]},
+            "status": {"$ifNull": ["$status", "Pending"]},
+            "priority": {"$ifNull": ["$priority", "Medium"]},
+            "project": {"$ifNull": [{"$first": "$project.name"}, "No project"]},
+        }},
+    ]
+    return jsonify(list(get_read_db().tasks.aggregate(pipeline)))
 
 
 @app.route("/api/report/<report_type>")
 @login_required
 def api_report(report_type):
-    from collections import Counter
-    db = get_db()
-    lines = []
-    if report_type == "tasks":
-        tasks = list(db.tasks.find())
-        c = Counter(t.get("status", "Pending") for t in tasks)
-        lines = [f"{k}: {v} tasks" for k, v in c.items()]
-    elif report_type == "projects":
-        for p in db.projects.find():
-            n = db.tasks.count_documents({"project_id": p["_id"]})
-            lines.append(f"{p['name']}: {n} tasks")
-    elif report_type == "users":
-        for u in db.users.find():
-            n = db.tasks.count_documents({"assigned_to": u["_id"]})
-            lines.append(f"{u['username']}: {n} tasks assigned")
-    return jsonify({"lines": lines})
+    return jsonify({"lines": _report_lines(report_type)})
+
+
+# report_type -> (collection, pipeline, line template); built once at import
+REPORTS = {
+    "tasks": (
+        "tasks",
+        [{"$group": {"_id": {"$ifNull": ["$status", "Pending"]}, "n": {"$sum": 1}}}],
+        "{_id}: {n} tasks",
+    ),
+    "projects": (
+        "projects",
+        [
+            {"$lookup": {
+                "from": "tasks",
+                "localField": "_id",
+                "foreignField": "project_id",
+                "as": "counts",
+                "pipeline": [{"$count": "n"}],
+            }},
+            {"$project": {"name": 1, "n": {"$ifNull": [{"$first": "$counts.n"}, 0]}}},
+        ],
+        "{name}: {n} tasks",
+    ),
+    "users": (
+        "users",
+        [
+            {"$lookup": {
+                "from": "tasks",
+                "localField": "_id",
+                "foreignField": "assigned_to",
+                "as": "counts",
+                "pipeline": [{"$count": "n"}],
+            }},
+            {"$project": {"username": 1, "n": {"$ifNull": [{"$first": "$counts.n"}, 0]}}},
+        ],
+        "{username}: {n} tasks assigned",
+    ),
+}
+
+
+@cache.memoize()
+def _report_lines(report_type):
+    """Report text lines for report_type (see REPORTS); cached, see _invalidate_reports."""
+    if report_type not in REPORTS:
+        return []
+    collection, pipeline, line = REPORTS[report_type]
+    # Read the primary: a lagging secondary right after _invalidate_reports would cache stale lines
+    return [line.format(**r) for r in get_db()[collection].aggregate(pipeline)]
+
+
+def _invalidate_reports():
+    """Drop cached report lines after tasks, projects or users change."""
+    cache.delete_memoized(_report_lines)
 
 
 @app.route("/export/csv")
 @login_required
 def export_csv():
-    db = get_db()
-    tasks = list(db.tasks.find())
-    projects_by_id = {str(p["_id"]): p["name"] for p in db.projects.find()}
-    users_by_id = {str(u["_id"]): u["username"] for u in db.users.find()}
-    output = io.StringIO()
-    w = csv.writer(output)
-    w.writerow(["ID", "Title", "Status", "Priority", "Project", "Assigned", "Due"])
-    for t in tasks:
-        pid = str(t.get("project_id")) if t.get("project_id") else None
-        aid = str(t.get("assigned_to")) if t.get("assigned_to") else None
-        dd = t.get("due_date")
-        due_str = dd.isoformat() if isinstance(dd, date) and dd else (str(dd)[:10] if dd else "")
-        w.writerow([
-            str(t["_id"]),
-            t.get("title", ""),
-            t.get("status", "Pending"),
-            t.get("priority", "Medium"),
-            projects_by_id.get(pid, "No project"),
-            users_by_id.get(aid, "Unassigned"),
-            due_str,
-        ])
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode("utf-8-sig")),
+    cursor = get_read_db().tasks.aggregate(
+        [{"$sort": {"_id": 1}}] + TASK_LIST_PIPELINE,
+        batchSize=500,
+    )
+
+    def generate():
+        # Reuse one small buffer so memory stays flat regardless of the number of tasks
+        output = io.StringIO()
+        w = csv.writer(output)
+        w.writerow(["ID", "Title", "Status", "Priority", "Project", "Assigned", "Due"])
+        yield output.getvalue().encode("utf-8-sig")
+        for t in cursor:
+            output.seek(0)
+            output.truncate()
+            dd = t.get("due_date")
+            due_str = dd.isoformat() if isinstance(dd, date) and dd else (str(dd)[:10] if dd else "")
+            w.writerow([
+                str(t["_id"]),
+                t.get("title", ""),
+                t.get("status", "Pending"),
+                t.get("priority", "Medium"),
+                t.get("project_name") or "No project",
+                t.get("assignee_username") or "Unassigned",
+                due_str,
+            ])
+            yield output.getvalue().encode("utf-8")
+
+    return Response(
+        generate(),
         mimetype="text/csv",
-        as_attachment=True,
-        download_name="tasks_export.csv",
+        headers={"Content-Disposition": "attachment; filename=tasks_export.csv"},
     )
 
 
-def _add_history(task_id, action, old_value, new_value):
-    get_db().history.insert_one({
+def _history_doc(task_id, action, old_value, new_value):
+    """Build a history entry for the current user (insert with _record_task_events)."""
+    return {
         "task_id": task_id,
         "user_id": get_current_user()["_id"],
         "action": action,
         "old_value": old_value,
         "new_value": new_value,
         "timestamp": datetime.utcnow(),
-    })
+    }
 
 
-def _add_notification(user_id, message, type_="info"):
-    get_db().notifications.insert_one({
+def _notification_doc(user_id, message, type_="info"):
+    """Build an unread notification (insert with _record_task_events)."""
+    return {
         "user_id": user_id,
         "message": message,
         "type": type_,
         "read": False,
         "created_at": datetime.utcnow(),
-    })
+    }
+
+
+def _record_task_events(history_docs, notification_docs=()):
+    """Insert history and notification docs with one unordered insert_many per collection."""
+    db = get_db()
+    if history_docs:
+        db.history.insert_many(history_docs, ordered=False)
+    if notification_docs:
+        db.notifications.insert_many(notification_docs, ordered=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""Gunicorn settings, loaded automatically by `gunicorn app:app` from the project root.
+
+Requests spend most of their time waiting on MongoDB, so each worker process
+serves several requests concurrently on threads (PyMongo's client is thread-safe
+and shares one connection pool per process).
+
+Environment overrides:
+  - WEB_CONCURRENCY: worker processes (default 2)
+  - GUNICORN_THREADS: threads per worker (default 8)
+  - PORT: listen port (read by Gunicorn itself)
+"""
+import os
+
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
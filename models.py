@@ -1,7 +1,7 @@
 """MongoDB collections used by Task Manager (see db.py for connection).
 
 Collections:
-  - users:     { _id, username, password }
+  - users:     { _id, username, password_hash }
   - projects:  { _id, name, description }
   - tasks:    { _id, title, description, status, priority, project_id, assigned_to,
                 due_date, estimated_hours, actual_hours, created_by, created_at, updated_at }
@@ -9,6 +9,17 @@ Collections:
   - history:  { _id, task_id, user_id, action, old_value, new_value, timestamp }
   - notifications: { _id, user_id, message, type, read, created_at }
 
+Indexes (created in db.ensure_indexes, run by db.init_db in every process):
+  - users:         username (unique)
+  - tasks:         project_id; assigned_to; (status, priority); priority; (due_date, status);
+                   text on (title, description), title weighted 10
+  - comments:      (task_id, created_at)
+  - history:       (task_id, timestamp desc); timestamp desc
+  - notifications: (user_id, read, created_at desc)
+
+users.password_hash is a werkzeug.security salted hash. Documents still holding a
+legacy plaintext 'password' are upgraded to password_hash on the next successful login.
+
 All _id and foreign key fields (project_id, assigned_to, created_by, user_id, task_id)
 are MongoDB ObjectId. Use MONGODB_URI in the environment to set the connection string.
 """